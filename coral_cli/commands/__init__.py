@@ -0,0 +1,3 @@
+"""
+Implementations of the `coral` sub-commands, imported on demand by coral_cli.cli.
+"""
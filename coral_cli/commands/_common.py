@@ -0,0 +1,105 @@
+"""
+Shared state for the CLI commands: the console, common constants and prerequisite checks.
+"""
+from pathlib import Path
+from typing import Optional
+
+import typer
+import os
+import sys
+import shutil
+import functools
+
+class _LazyConsole:
+    """Proxy that imports rich and builds the Console on first use."""
+    _console = None
+
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            if sys.stdout.isatty():
+                _LazyConsole._console = Console()
+            else:
+                # Piped / CI output: don't re-wrap lines at a guessed width or colour-highlight
+                # reprs nobody will see, so each print is little more than a write
+                _LazyConsole._console = Console(soft_wrap=True, highlight=False)
+        return getattr(_LazyConsole._console, name)
+
+console = _LazyConsole()
+
+# --- Constants ---
+DEFAULT_CHATROOM_PORT = 3001
+CORAL_CONFIG_DIR = Path.home() / ".coral"
+PACKAGE_DIR = Path(__file__).resolve().parent.parent # coral_cli/, home of binaries/ and dockerfiles/
+
+# --- Helper Functions ---
+
+@functools.lru_cache(maxsize=1)
+def _coral_config_dir() -> Path:
+    """Return ~/.coral, creating it (and its bin/ subdirectory) once per process."""
+    bin_dir = CORAL_CONFIG_DIR / "bin"
+    if not os.path.isdir(bin_dir):
+        bin_dir.mkdir(parents=True, exist_ok=True)
+    return CORAL_CONFIG_DIR
+
+# Prompt helpers: questionary (and prompt_toolkit under it) is only imported once we
+# actually have to ask something, so fully scripted invocations never load it.
+
+def _ask_text(message: str, **kwargs):
+    import questionary
+    return questionary.text(message, **kwargs).ask()
+
+def _ask_confirm(message: str, **kwargs):
+    import questionary
+    return questionary.confirm(message, **kwargs).ask()
+
+def _ask_select(message: str, **kwargs):
+    import questionary
+    return questionary.select(message, **kwargs).ask()
+
+@functools.lru_cache(maxsize=1)
+def is_docker_installed():
+    """Check if Docker CLI is installed and accessible."""
+    return shutil.which("docker") is not None
+
+@functools.lru_cache(maxsize=1)
+def is_git_installed():
+    """Check if Git CLI is installed and accessible."""
+    return shutil.which("git") is not None
+
+@functools.lru_cache(maxsize=1)
+def check_openai_key():
+    """Check if OPENAI_API_KEY environment variable is set."""
+    return os.getenv("OPENAI_API_KEY") is not None
+
+@functools.lru_cache(maxsize=None)
+def _resolved_api_key(explicit: Optional[str]) -> Optional[str]:
+    """The --openai-api-key value if given, else OPENAI_API_KEY from the environment."""
+    return explicit or os.getenv("OPENAI_API_KEY")
+
+def _require_openai_key(explicit: Optional[str]) -> str:
+    """Resolve the OpenAI API key or exit with instructions when there is none."""
+    resolved_api_key = _resolved_api_key(explicit)
+    if not resolved_api_key:
+        console.print("[bold red]Error: OPENAI_API_KEY is required but not set.[/bold red]")
+        console.print("[bold yellow]Please set the OPENAI_API_KEY environment variable or use the --openai-api-key option.[/bold yellow]")
+        raise typer.Exit(1)
+    return resolved_api_key
+
+def _require_docker(run_option: str) -> None:
+    """Exit with setup instructions when the docker CLI is missing; run_option names the flag that picked Docker."""
+    if is_docker_installed():
+        return
+    console.print(f"[bold red]Error: Docker is required for '{run_option} docker', but the 'docker' command was not found.[/bold red]")
+    console.print("[bold yellow]Please ensure Docker Desktop (or Docker Engine) is installed, running, and that the 'docker' command is accessible in your system's PATH.[/bold yellow]")
+    console.print("[bold yellow]You can test this by simply typing 'docker --version' in your terminal.[/bold yellow]")
+    console.print(f"[bold yellow]Alternatively, choose '{run_option} local' if you prefer not to use Docker.[/bold yellow]")
+    raise typer.Exit(1)
+
+def _require_git() -> None:
+    """Exit with setup instructions when the git CLI is missing."""
+    if is_git_installed():
+        return
+    console.print("[bold red]Error: Git is required to clone the repository, but the 'git' command was not found.[/bold red]")
+    console.print("[bold yellow]Please install Git (https://git-scm.com/downloads) and make sure 'git' is in your PATH.[/bold yellow]")
+    raise typer.Exit(1)
@@ -0,0 +1,243 @@
+"""
+Running child processes (servers, agents) with their output streamed to the console.
+"""
+from pathlib import Path
+from typing import Optional
+
+import subprocess
+import os
+import signal
+import asyncio
+import contextlib
+
+from coral_cli.commands._common import console
+
+SERVER_READY_TIMEOUT_SECONDS = 30 # How long a local server may take to bind its port
+# Environment variables forwarded to locally-run agents; everything else is left out.
+# Besides the API key this covers what Python, native libraries, SSL and HTTP clients
+# (and an agent talking to the user's terminal) need to work on POSIX and Windows.
+CHILD_ENV_KEYS = (
+    "PATH", "HOME", "USERPROFILE", "SYSTEMROOT", "TEMP", "TMP", "TMPDIR", "TERM", "USER", "USERNAME",
+    "APPDATA", "LOCALAPPDATA", "PATHEXT", "COMSPEC",
+    "LANG", "LC_ALL", "LC_CTYPE", "PYTHONPATH", "PYTHONIOENCODING", "VIRTUAL_ENV",
+    "LD_LIBRARY_PATH", "DYLD_LIBRARY_PATH",
+    "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY", "http_proxy", "https_proxy", "no_proxy",
+    "SSL_CERT_FILE", "SSL_CERT_DIR", "REQUESTS_CA_BUNDLE",
+    "OPENAI_API_KEY", "OPENAI_BASE_URL", "OPENAI_API_BASE_URL",
+)
+TERMINATE_GRACE_SECONDS = 5 # How long a child gets to exit after SIGTERM before it is killed
+OUTPUT_QUEUE_MAXSIZE = 1024 # Lines of child output buffered before reading pauses
+
+async def _pump_output(stream: asyncio.StreamReader, queue: asyncio.Queue, is_stderr: bool):
+    """Read a child's output stream line by line into the shared output queue."""
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+        # Blocks when the queue is full, which stops reading and lets the pipe
+        # back-pressure the child instead of buffering a log storm in memory.
+        await queue.put((is_stderr, line))
+
+async def _print_output(queue: asyncio.Queue):
+    """Print queued child output until the None sentinel arrives."""
+    while True:
+        item = await queue.get()
+        if item is None:
+            break
+        is_stderr, line = item
+        text = line.decode(errors="replace").rstrip()
+        console.print(text, markup=False, highlight=False, style="yellow" if is_stderr else None)
+
+async def _wait_for_port(host: str, port: int, timeout: float, interval: float = 0.1) -> bool:
+    """Poll until something accepts connections on host:port; False if that takes longer than timeout."""
+    async def _poll():
+        while True:
+            try:
+                _, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                await asyncio.sleep(interval)
+                continue
+            writer.close()
+            await writer.wait_closed()
+            return
+
+    try:
+        await asyncio.wait_for(_poll(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+async def _run_streaming(cmd: list, env: Optional[dict] = None, cwd=None, ready_port: Optional[int] = None,
+                         stdin_data: Optional[bytes] = None, ready_timeout: float = SERVER_READY_TIMEOUT_SECONDS) -> int:
+    """
+    Run a child process, streaming its stdout/stderr to the console.
+
+    If stdin_data is given it is written to the child's stdin, which is then
+    closed (e.g. to feed a script to `python -`). If ready_port is given, the
+    child is stopped when nothing listens on that port within ready_timeout.
+
+    Ctrl+C terminates the child instead of tearing down the event loop; once the
+    child has exited, KeyboardInterrupt is re-raised so callers keep their usual
+    handling. SIGTERM/SIGHUP stop the child the same way, then exit (see
+    _terminate_on_sigint). Returns the child's exit code.
+    """
+    # Popen blocks on fork/exec (seconds for a cold JVM), so spawn in a worker
+    # thread and only then attach the child's pipes to the event loop.
+    proc = await asyncio.to_thread(
+        subprocess.Popen,
+        cmd,
+        stdin=subprocess.PIPE if stdin_data is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=0,
+        env=env,
+        cwd=cwd,
+        # Own process group (same session), so stopping it also stops whatever it spawned
+        # (MCP tool servers etc.); Ctrl+C, SIGTERM and SIGHUP reach it only through
+        # _terminate_on_sigint, which forwards them via _terminate_gracefully
+        process_group=0 if os.name == "posix" else None,
+    )
+    if stdin_data is not None:
+        await asyncio.to_thread(_write_and_close, proc.stdin, stdin_data)
+    loop = asyncio.get_running_loop()
+    readers, transports = [], []
+    for pipe in (proc.stdout, proc.stderr):
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+        readers.append(reader)
+        transports.append(transport)
+    output_queue = asyncio.Queue(maxsize=OUTPUT_QUEUE_MAXSIZE)
+    printer_task = asyncio.create_task(_print_output(output_queue))
+
+    async def _watch_readiness():
+        if await _wait_for_port("localhost", ready_port, ready_timeout):
+            console.print(f"[bold green]Server is ready and accepting connections on port {ready_port}.[/bold green]")
+        elif proc.poll() is None:
+            console.print(f"[bold red]Server did not accept connections on port {ready_port} within {ready_timeout:g}s; stopping it.[/bold red]")
+            await _terminate_gracefully(proc)
+
+    ready_task = asyncio.create_task(_watch_readiness()) if ready_port else None
+    async with _terminate_on_sigint(proc):
+        try:
+            await asyncio.gather(
+                _pump_output(readers[0], output_queue, is_stderr=False),
+                _pump_output(readers[1], output_queue, is_stderr=True),
+            )
+            await output_queue.put(None)
+            await printer_task
+            returncode = await asyncio.to_thread(proc.wait)
+        finally:
+            if ready_task:
+                ready_task.cancel()
+            printer_task.cancel()
+            for transport in transports:
+                transport.close()
+    return returncode
+
+async def _run_attached(cmd: list, env: Optional[dict] = None, cwd=None) -> int:
+    """
+    Run a child process on the terminal's own stdin/stdout/stderr, for agents
+    that talk to the user directly. Ctrl+C is handled as in _run_streaming.
+    Returns the child's exit code.
+    """
+    proc = await asyncio.to_thread(subprocess.Popen, cmd, env=env, cwd=cwd)
+    async with _terminate_on_sigint(proc):
+        returncode = await asyncio.to_thread(proc.wait)
+    return returncode
+
+# Signals that stop a running child instead of just this process: Ctrl+C, `kill`, and
+# the terminal closing (the child sits in its own process group, so it gets none of them)
+STOP_SIGNALS = tuple(getattr(signal, name) for name in ("SIGINT", "SIGTERM", "SIGHUP") if hasattr(signal, name))
+
+@contextlib.asynccontextmanager
+async def _terminate_on_sigint(proc: subprocess.Popen):
+    """
+    While active, Ctrl+C (and SIGTERM/SIGHUP) gracefully terminates proc instead of
+    tearing down the event loop. proc is always stopped on exit; afterwards
+    KeyboardInterrupt is raised if Ctrl+C was the reason, SystemExit(128 + signal)
+    for the other two.
+    """
+    # A signal only flags the stop; the actual teardown runs as a task so the
+    # caller keeps draining output while the child gets its grace period.
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
+    received = []
+    installed = []
+
+    def _request_stop(signum):
+        received.append(signum)
+        stop_requested.set()
+
+    for signum in STOP_SIGNALS:
+        try:
+            loop.add_signal_handler(signum, _request_stop, signum)
+            installed.append(signum)
+        except (NotImplementedError, RuntimeError):
+            pass # e.g. Windows: KeyboardInterrupt propagates as usual
+
+    async def _stop_when_requested():
+        await stop_requested.wait()
+        await _terminate_gracefully(proc)
+
+    stop_task = asyncio.create_task(_stop_when_requested())
+    try:
+        yield
+    finally:
+        stop_task.cancel()
+        for signum in installed:
+            loop.remove_signal_handler(signum)
+        await _terminate_gracefully(proc)
+
+    if received:
+        if received[0] == signal.SIGINT:
+            raise KeyboardInterrupt
+        raise SystemExit(128 + received[0])
+
+def _child_env(**overrides) -> dict:
+    """Minimal environment for a child process: CHILD_ENV_KEYS from os.environ plus overrides."""
+    env = {key: os.environ[key] for key in CHILD_ENV_KEYS if key in os.environ}
+    env.update(overrides)
+    return env
+
+async def _write_files(files: dict) -> None:
+    """Write {path: text} concurrently, each write on a worker thread so the loop never blocks."""
+    await asyncio.gather(*(
+        asyncio.to_thread(Path(path).write_text, content, encoding="utf-8")
+        for path, content in files.items()
+    ))
+
+async def _terminate_gracefully(proc: subprocess.Popen, grace_period: float = TERMINATE_GRACE_SECONDS) -> None:
+    """SIGTERM the child, then SIGKILL it if it is still alive after grace_period seconds."""
+    if proc.poll() is not None:
+        return
+    _signal_child(proc, force=False)
+    try:
+        await asyncio.wait_for(asyncio.to_thread(proc.wait), grace_period)
+    except asyncio.TimeoutError:
+        _signal_child(proc, force=True)
+        await asyncio.to_thread(proc.wait)
+
+def _signal_child(proc: subprocess.Popen, force: bool) -> None:
+    """SIGTERM (SIGKILL if force) proc, or its whole process group when it leads one."""
+    if os.name == "posix":
+        try:
+            if os.getpgid(proc.pid) == proc.pid:
+                os.killpg(proc.pid, signal.SIGKILL if force else signal.SIGTERM)
+                return
+        except ProcessLookupError:
+            return # Already gone
+    if force:
+        proc.kill()
+    else:
+        proc.terminate()
+
+def _write_and_close(pipe, data: bytes) -> None:
+    try:
+        pipe.write(data)
+    except BrokenPipeError:
+        pass # Child exited early; its exit code tells the story
+    finally:
+        try:
+            pipe.close()
+        except BrokenPipeError:
+            pass
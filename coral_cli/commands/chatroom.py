@@ -0,0 +1,382 @@
+"""
+`coral chatroom`: run the Coral chatroom server locally (Java) or in Docker.
+"""
+from pathlib import Path
+from typing import Optional
+
+import typer
+import subprocess
+import os
+import shutil
+import stat
+import asyncio
+import functools
+import hashlib
+
+from coral_cli.commands._common import (
+    console, DEFAULT_CHATROOM_PORT, CORAL_CONFIG_DIR, PACKAGE_DIR,
+    _coral_config_dir, _require_docker,
+)
+from coral_cli.commands._process import _run_streaming
+
+CORAL_SERVER_DOCKER_REPO = "coral-protocol/coral-server"
+CORAL_SERVER_DOCKER_IMAGE = f"{CORAL_SERVER_DOCKER_REPO}:latest"
+JAR_PATH_CACHE_FILE = CORAL_CONFIG_DIR / "jar_path.txt" # "<resolved jar path>\n<st_mtime_ns>"
+
+def run(action: str, port: int, mode: str, run_mode: str, verify_java_version: bool):
+    """Manage the Coral chatroom server (local Java or Docker)."""
+    if action == "start":
+        if run_mode == "local":
+            start_chatroom_server_local(port, mode, verify_java_version)
+        elif run_mode == "docker":
+            start_chatroom_server_docker(port)
+        else:
+            console.print(f"[bold red]Invalid run mode '{run_mode}'. Choose 'local' or 'docker'.[/bold red]")
+            raise typer.Exit(1)
+    # Add stop/status later if needed
+    # elif action == "stop":
+    #     stop_chatroom_server(run_mode) # Stop might need to know how it was started
+    else:
+        console.print(f"[bold red]Unknown action: {action}[/bold red]")
+        console.print("[bold yellow]Available actions: start[/bold yellow]") # Update available actions
+
+
+def start_chatroom_server_local(port: int, mode: str, verify_java_version: bool = False):
+    """Start the Coral chatroom server locally using the Java JAR"""
+    console.print("[bold blue]Starting Coral chatroom server locally (Java)...[/bold blue]")
+
+    # Check if Java is installed
+    if not is_java_installed():
+        console.print("[bold red]Error: Java is not installed or not in PATH[/bold red]")
+        console.print("[bold yellow]Please install Java to run the Coral chatroom server:[/bold yellow]")
+        console.print("1. Download and install Java from https://adoptium.net/")
+        console.print("2. Make sure Java is in your PATH")
+        console.print("3. Try running 'coral chatroom start' again")
+        raise typer.Exit(1) # Exit if Java is missing
+
+    if verify_java_version:
+        java_version = get_java_version()
+        if not java_version:
+            console.print("[bold red]Error: 'java -version' failed. Is your Java installation working?[/bold red]")
+            raise typer.Exit(1)
+        console.print(f"Using Java: {java_version}")
+
+    # Get the path to the JAR file
+    jar_path = get_server_jar()
+    if not jar_path:
+        console.print("[bold red]Error: Server JAR not found.[/bold red]")
+        console.print("[bold yellow]Attempting to locate server JAR...")
+        # Add logic here to potentially download or guide the user if needed
+        # For now, just exit
+        raise typer.Exit(1)
+    else:
+        console.print(f"Using server JAR: {jar_path}")
+
+    # Validate the mode before building the command
+    if mode == "stdio":
+        console.print("[bold yellow]Note: --port option is ignored in stdio mode.[/bold yellow]")
+    elif mode != "sse":
+        console.print(f"[bold red]Unknown mode: {mode}[/bold red]")
+        console.print("[bold yellow]Available modes for local run: sse, stdio[/bold yellow]")
+        raise typer.Exit(1)
+
+    try:
+        cmd = _jvm_cmd(jar_path, port, mode)
+        console.print(f"[bold green]Running command: {' '.join(cmd)}[/bold green]")
+        if mode == "sse":
+            console.print(f"[bold green]Server URL (local): http://localhost:{port}/sse[/bold green]")
+
+        console.print("[bold yellow]Press Ctrl+C to stop the server[/bold yellow]")
+        ready_port = port if mode == "sse" else None
+        returncode = asyncio.run(_run_streaming(cmd, ready_port=ready_port))
+        if returncode != 0:
+            console.print(f"[bold red]Coral chatroom server exited with code {returncode}.[/bold red]")
+            raise typer.Exit(1)
+
+    except KeyboardInterrupt:
+        console.print("\n[bold green]Coral chatroom server stopped by user.[/bold green]")
+    except FileNotFoundError:
+        console.print("[bold red]Error: 'java' command not found. Is Java installed and in your PATH?[/bold red]")
+        raise typer.Exit(1)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[bold red]Error starting local server: {str(e)}[/bold red]")
+        raise typer.Exit(1)
+
+
+@functools.lru_cache(maxsize=None)
+def _jvm_cmd(jar_path: str, port: int, mode: str) -> tuple:
+    """Build the (immutable, reusable) java command line for the given server mode."""
+    if mode == "sse":
+        return ("java", "-jar", jar_path, "--sse-server-ktor", str(port))
+    return ("java", "-jar", jar_path, "--stdio")
+
+
+def start_chatroom_server_docker(port: int):
+    """Start the Coral chatroom server using Docker"""
+    console.print("[bold blue]Starting Coral chatroom server (Docker)...[/bold blue]")
+
+    # Check Docker prerequisite
+    _require_docker("--run-mode")
+
+    # --- Define Paths relative to CLI ---
+    cli_dir = PACKAGE_DIR # Docker build context: holds dockerfiles/ and binaries/
+    dockerfile_path = cli_dir / "dockerfiles" / "coral-server.Dockerfile"
+    jar_name = "coral-server.jar" # Expected JAR name
+    jar_in_binaries = cli_dir / "binaries" / jar_name
+
+    # --- Find Dockerfile ---
+    if not _stat_regular_file(dockerfile_path):
+        console.print(f"[bold red]Error: Coral Server Dockerfile not found.[/bold red]")
+        console.print(f"[bold yellow]Expected location: {dockerfile_path}[/bold yellow]")
+        raise typer.Exit(1)
+    else:
+        console.print(f"Using Dockerfile: {dockerfile_path}")
+
+    # --- Ensure JAR exists in binaries/ for Build Context ---
+    if not _stat_regular_file(jar_in_binaries):
+        console.print(f"[yellow]Server JAR '{jar_name}' not found in '{cli_dir / 'binaries'}'.[/yellow]")
+        # Try finding it using get_server_jar and copy it if necessary
+        found_jar_path_str = get_server_jar() # This function already tries to copy to ~/.coral/bin
+        if found_jar_path_str:
+            found_jar_path = Path(found_jar_path_str)
+            # Ensure the binaries directory exists
+            (cli_dir / "binaries").mkdir(parents=True, exist_ok=True)
+            target_path = jar_in_binaries # The destination is binaries/coral-server.jar
+
+            # Copy the found JAR to the binaries directory (it was just found missing there,
+            # so there is no need to stat it again)
+            console.print(f"[yellow]Attempting to copy '{found_jar_path.name}' to '{target_path}'...[/yellow]")
+            try:
+                _link_or_copy(found_jar_path, target_path)
+                console.print("[green]JAR copied successfully to binaries/ for Docker build.[/green]")
+            except Exception as e:
+                console.print(f"[bold red]Error copying JAR to binaries/: {e}[/bold red]")
+                console.print(f"[bold yellow]Please ensure the server JAR '{jar_name}' exists in '{cli_dir / 'binaries'}' or run './gradlew build' in the 'coral-server' directory and retry.[/bold yellow]")
+                raise typer.Exit(1)
+        else:
+            # If get_server_jar also failed to find/copy it
+            console.print(f"[bold red]Error: Server JAR '{jar_name}' could not be located.[/bold red]")
+            console.print(f"[bold yellow]Please run './gradlew build' in the 'coral-server' directory, ensure the JAR is copied to '{cli_dir / 'binaries'}', and retry.[/bold yellow]")
+            raise typer.Exit(1)
+
+    # --- Build the Docker image (skipped when this JAR and Dockerfile were already built into one) ---
+    image_tag = f"{CORAL_SERVER_DOCKER_REPO}:{_files_digest(jar_in_binaries, dockerfile_path)}"
+    if _docker_image_exists(image_tag):
+        console.print(f"[green]Reusing Docker image '{image_tag}' (server JAR and Dockerfile unchanged).[/green]")
+    else:
+        _build_server_image(dockerfile_path, cli_dir, image_tag)
+
+    # --- Run the Docker container ---
+    container_name = "coral-chatroom-server"
+    console.print(f"Running Docker container '{container_name}' from image '{image_tag}'...")
+    try:
+        # Stop and remove existing container with the same name, if any (one docker call)
+        remove_cmd = ["docker", "rm", "-f", container_name]
+        subprocess.run(remove_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) # Ignore errors if container doesn't exist
+
+        run_cmd = [
+            "docker", "run",
+            "--rm", # Remove container when it exits
+            "-d",   # Run in detached mode (background)
+            "-p", f"{port}:{DEFAULT_CHATROOM_PORT}", # Map host port to container port
+            "--name", container_name,
+            image_tag
+        ]
+        subprocess.run(run_cmd, check=True, capture_output=True, text=True)
+        console.print(f"[bold green]✅ Coral chatroom server started in Docker container '{container_name}'.[/bold green]")
+        console.print(f"[bold green]   Host Port: {port}[/bold green]")
+        console.print(f"[bold green]   Container Port: {DEFAULT_CHATROOM_PORT}[/bold green]")
+        console.print(f"[bold green]   Server URL (Docker): http://localhost:{port}/sse[/bold green]")
+        console.print(f"[bold yellow]To view logs: docker logs {container_name}[/bold yellow]")
+        console.print(f"[bold yellow]To stop: docker stop {container_name}[/bold yellow]")
+
+    except FileNotFoundError:
+         console.print("[bold red]Error: 'docker' command not found. Is Docker installed and in your PATH?[/bold red]")
+         raise typer.Exit(1)
+    except subprocess.CalledProcessError as e:
+        console.print(f"[bold red]Error running Docker container: {e}[/bold red]")
+        if e.stderr:
+            console.print(f"[bold red]Stderr:[/bold red]\n{e.stderr}")
+        raise typer.Exit(1)
+    except Exception as e:
+         console.print(f"[bold red]An unexpected error occurred during Docker run: {e}[/bold red]")
+         raise typer.Exit(1)
+
+
+def _files_digest(*paths) -> str:
+    """Short sha256 over the given files' contents, used to tag the server image per JAR/Dockerfile build."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(hashlib.file_digest(f, "sha256").digest())
+    return digest.hexdigest()[:12]
+
+def _docker_image_exists(image: str) -> bool:
+    """Check the local image store only; a missing image (or daemon error) just means we build."""
+    try:
+        result = subprocess.run(["docker", "image", "inspect", image], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        return False
+    return result.returncode == 0
+
+def _build_server_image(dockerfile_path: Path, cli_dir: Path, image_tag: str) -> None:
+    """Build the chatroom server image from cli_dir (kept small by coral_cli/.dockerignore)."""
+    console.print(f"Building Docker image '{image_tag}' using context '{cli_dir}'...")
+    try:
+        # Also tag :latest so a plain `docker run coral-protocol/coral-server` keeps working
+        build_cmd = ["docker", "build", "-f", str(dockerfile_path), "-t", image_tag, "-t", CORAL_SERVER_DOCKER_IMAGE, "."]
+        build_process = subprocess.run(
+            build_cmd,
+            cwd=cli_dir,
+            capture_output=True, text=True, check=False # Don't raise on error yet
+        )
+
+        # Check for build errors
+        if build_process.returncode != 0:
+            # Check specifically for permission error
+            build_stderr = build_process.stderr.lower() # Lowercase once for both checks
+            if "permission denied" in build_stderr and "docker.sock" in build_stderr:
+                 console.print("[bold red]Docker Permission Error Detected![/bold red]")
+                 console.print("[bold yellow]The current user does not have permission to access the Docker daemon socket.[/bold yellow]")
+                 console.print("[bold yellow]On Linux, try adding your user to the 'docker' group:[/bold yellow]")
+                 print("  1. Run: [cyan]sudo usermod -aG docker $USER[/cyan]")
+                 print("  2. Log out and log back in, or run: [cyan]newgrp docker[/cyan] in your terminal.")
+                 print("[bold yellow]Then, try running the coral command again.[/bold yellow]")
+                 # Exit cleanly after printing the specific error message
+                 raise typer.Exit(1) # Use typer.Exit to stop execution here
+            else:
+                # Print generic build error
+                console.print(f"[bold red]Error building Docker image (Return Code: {build_process.returncode}):[/bold red]")
+                console.print(build_process.stderr)
+                raise typer.Exit(1) # Exit on generic build error too
+
+        console.print("[green]Docker image built successfully.[/green]")
+
+    except FileNotFoundError:
+         console.print("[bold red]Error: 'docker' command not found. Is Docker installed and in your PATH?[/bold red]")
+         raise typer.Exit(1)
+    except typer.Exit: # Re-raise typer.Exit to ensure it propagates correctly
+        raise
+    except Exception as e:
+         # Catch other potential exceptions during build setup or execution
+         console.print(f"[bold red]An unexpected error occurred during Docker build setup or execution: {e}[/bold red]")
+         raise typer.Exit(1)
+
+
+def _link_or_copy(src, dst) -> None:
+    """Hard-link src to dst (no data copied for a multi-MB JAR); copy when linking fails, e.g. across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+def _stat_regular_file(path) -> Optional[os.stat_result]:
+    """Single-syscall replacement for `exists() and is_file()`; returns the stat result or None."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+def _read_cached_jar_path() -> Optional[str]:
+    """Return the JAR path recorded by a previous run if that file is unchanged."""
+    try:
+        with open(JAR_PATH_CACHE_FILE, "r") as f:
+            cached_path, cached_mtime = f.read().splitlines()[:2]
+    except (OSError, ValueError):
+        return None
+    st = _stat_regular_file(cached_path)
+    if st is None or str(st.st_mtime_ns) != cached_mtime:
+        return None
+    return cached_path
+
+def _write_cached_jar_path(jar_path: str) -> None:
+    st = _stat_regular_file(jar_path)
+    if st is None:
+        return
+    try:
+        _coral_config_dir()
+        with open(JAR_PATH_CACHE_FILE, "w") as f:
+            f.write(f"{os.path.abspath(jar_path)}\n{st.st_mtime_ns}")
+    except OSError:
+        pass # Caching is an optimisation only
+
+@functools.lru_cache(maxsize=1)
+def get_server_jar() -> Optional[str]:
+    """
+    Resolve the Coral server JAR, memoised for the process and across runs.
+
+    A path recorded in ~/.coral/jar_path.txt is reused as long as the file's
+    mtime still matches; otherwise the full search below runs again.
+    """
+    cached_jar = _read_cached_jar_path()
+    if cached_jar:
+        return cached_jar
+    jar_path = _locate_server_jar()
+    if jar_path:
+        _write_cached_jar_path(jar_path)
+    return jar_path
+
+def _locate_server_jar() -> Optional[str]:
+    # ... (get_server_jar implementation - ensure it finds the correct JAR name, e.g., coral-server-1.0-SNAPSHOT.jar) ...
+    # Adjust the dev_jar_path if the snapshot name changes
+    script_dir = PACKAGE_DIR
+    # Make sure this name matches the actual built JAR name
+    jar_name = "coral-server.jar"
+    dev_jar_path = script_dir.parent / "coral-server" / "build" / "libs" / jar_name
+
+    locations = [
+        PACKAGE_DIR / "binaries" / jar_name,
+        CORAL_CONFIG_DIR / "bin" / jar_name,
+    ]
+
+    for loc in locations:
+        if _stat_regular_file(loc):
+            return str(loc)
+
+    if _stat_regular_file(dev_jar_path):
+        # The config JAR was already probed above, so it is known to be missing here
+        config_jar = CORAL_CONFIG_DIR / "bin" / jar_name
+        try:
+            console.print(f"Found development JAR, copying to {config_jar}...")
+            _coral_config_dir()
+            _link_or_copy(dev_jar_path, config_jar)
+            return str(config_jar)
+        except Exception as e:
+            console.print(f"[bold yellow]Warning: Could not copy dev JAR: {e}[/bold yellow]")
+            return str(dev_jar_path)
+
+    console.print(f"[bold red]Server JAR '{jar_name}' not found in standard locations:[/bold red]")
+    # ... (print locations) ...
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def get_server_dir() -> Optional[Path]: # Return Optional[Path]
+    """Get the path to the server directory relative to the CLI script."""
+    server_dir = PACKAGE_DIR.parent / "coral-server"
+    try:
+        if stat.S_ISDIR(os.stat(server_dir).st_mode):
+            return server_dir
+    except OSError:
+        pass
+    return None
+
+@functools.lru_cache(maxsize=1)
+def is_java_installed():
+    """Check if Java is installed"""
+    # A PATH lookup is enough here; spinning up a JVM just to probe for it is not
+    return shutil.which("java") is not None
+
+def get_java_version() -> Optional[str]:
+    """Return the first line of `java -version` (e.g. 'openjdk version "21.0.2" ...'), or None."""
+    try:
+        result = subprocess.run(["java", "-version"], capture_output=True, text=True)
+    except OSError:
+        return None
+    output = (result.stderr or result.stdout).strip() # The JVM reports its version on stderr
+    if result.returncode != 0 or not output:
+        return None
+    return output.splitlines()[0]
@@ -0,0 +1,136 @@
+"""
+`coral coralize-mcp`: wrap an existing MCP server as a Coral agent.
+"""
+from pathlib import Path
+from typing import Optional
+
+import typer
+import sys
+import asyncio
+import importlib.util
+
+from coral_cli.commands._common import console, check_openai_key, _require_docker, _ask_text, _ask_confirm
+from coral_cli.commands._process import _run_streaming, _child_env, _write_files
+
+def run(target_url: str, agent_id: Optional[str], system_message: Optional[str], coral_url: str,
+        run_mode: str, output_dir: Optional[Path]):
+    """Wrap an existing MCP server as a Coral agent and run it."""
+    from coral_cli.coralizer.mcp_coralizer import MCPCoralizer, _docker_slug
+
+    console.print(f"[bold blue]🐠 Coralizing MCP server: {target_url}[/bold blue]")
+
+    # --- Input Validation and Prompts ---
+    if not agent_id:
+        agent_id = _ask_text("Enter a unique Agent ID for Coral:")
+        if not agent_id:
+            console.print("[bold red]Agent ID is required.[/bold red]")
+            raise typer.Exit(1)
+
+    if not system_message:
+        default_sys_msg = f"You are an agent named '{agent_id}'. Your goal is to act as a bridge to an external MCP server located at {target_url}. Use the tools provided by both the Coral server and the target server to respond to requests and fulfill tasks. Prioritize using the target server's tools when appropriate for its functions."
+        system_message = _ask_text(
+            "Enter the system message for the agent:",
+            default=default_sys_msg
+        )
+        if not system_message:
+            console.print("[bold red]System message is required.[/bold red]")
+            raise typer.Exit(1)
+
+    if run_mode not in ["docker", "local"]:
+        console.print(f"[bold red]Invalid run mode '{run_mode}'. Choose 'docker' or 'local'.[/bold red]")
+        raise typer.Exit(1)
+
+    # --- Prerequisite Checks ---
+    console.print("Checking prerequisites...")
+    if not check_openai_key():
+        console.print("[bold red]Error: OPENAI_API_KEY environment variable is not set.[/bold red]")
+        console.print("[bold yellow]Please set your OpenAI API key to allow the agent to function.[/bold yellow]")
+        # Decide whether to exit or proceed with a warning
+        if not _ask_confirm("Proceed anyway (agent will likely fail)?", default=False):
+             raise typer.Exit(1)
+
+
+    if run_mode == "docker":
+        _require_docker("--run")
+
+    console.print("[green]Prerequisites check passed.[/green]")
+
+    # --- Instantiate Coralizer ---
+    coralizer = MCPCoralizer(
+        coral_server_url=coral_url,
+        target_mcp_url=target_url,
+        agent_id=agent_id,
+        system_message=system_message
+        # Add model_config options later if needed
+    )
+
+    # --- Generate Files ---
+    console.print("Generating Coral wrapper script and Dockerfile...")
+    try:
+        wrapper_script, dockerfile_content = coralizer.coralize()
+    except Exception as e:
+        console.print(f"[bold red]Error generating files: {e}[/bold red]")
+        raise typer.Exit(1)
+
+    # --- Handle Output ---
+    if output_dir:
+        console.print(f"Saving generated files to: {output_dir}")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        wrapper_path = output_dir / "coral_wrapper.py"
+        dockerfile_path = output_dir / "Dockerfile"
+        try:
+            asyncio.run(_write_files({
+                wrapper_path: wrapper_script,
+                dockerfile_path: dockerfile_content,
+            }))
+            agent_slug = _docker_slug(agent_id) # Same sanitization MCPCoralizer uses for image names
+            console.print(
+                "[bold green]✅ Files saved successfully![/bold green]\n"
+                "To run manually (using Docker):\n"
+                f"  cd {output_dir}\n"
+                f"  docker build -t mcp-coralizer-{agent_slug} .\n"
+                f"  docker run --rm -e OPENAI_API_KEY=$OPENAI_API_KEY --network=host mcp-coralizer-{agent_slug}\n"
+                "To run manually (locally):\n"
+                "  pip install camel-ai>=0.2.0 pydantic>=2.0 # Ensure dependencies are installed\n"
+                f"  python {wrapper_path}"
+            )
+
+        except IOError as e:
+            console.print(f"[bold red]Error saving files: {e}[/bold red]")
+            raise typer.Exit(1)
+    else:
+        # --- Execute ---
+        if run_mode == "docker":
+            console.print("Attempting to build and run Docker container...")
+            try:
+                # build_and_run now handles the API key check internally
+                coralizer.build_and_run(wrapper_script, dockerfile_content)
+            except Exception as e: # Catch potential exceptions from build_and_run
+                 console.print(f"[bold red]An error occurred during Docker execution: {e}[/bold red]")
+                 raise typer.Exit(1)
+
+        elif run_mode == "local":
+            console.print("Attempting to run locally...")
+            # Check if camel-ai seems importable (spec lookup only, camel's import-time code isn't run)
+            if importlib.util.find_spec("camel") is None:
+                console.print("[bold yellow]Warning: 'camel-ai' library not found in the current Python environment.[/bold yellow]")
+                console.print("[bold yellow]Please install it ('pip install camel-ai') or the script might fail.[/bold yellow]")
+                if not _ask_confirm("Attempt to run anyway?", default=True):
+                    raise typer.Exit(1)
+
+            console.print("Running wrapper script (piped to the interpreter over stdin)")
+            console.print("[bold yellow]Press Ctrl+C to stop the agent.[/bold yellow]")
+            try:
+                # Run using the same Python interpreter that's running the CLI; `python -`
+                # reads the script from stdin, so nothing has to be written to disk.
+                # Pass only the environment the agent needs, especially the API key
+                asyncio.run(_run_streaming(
+                    [sys.executable, "-"],
+                    env=_child_env(),
+                    stdin_data=wrapper_script.encode("utf-8"),
+                ))
+            except KeyboardInterrupt:
+                # _run_streaming has already terminated the child by the time this propagates
+                console.print("\n[bold green]Local agent stopped.[/bold green]")
+            except Exception as e:
+                console.print(f"[bold red]Error running script locally: {e}[/bold red]")
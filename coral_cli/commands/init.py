@@ -0,0 +1,109 @@
+"""
+`coral init`: scaffold a new agent project from a template.
+"""
+from pathlib import Path
+from typing import Optional
+
+import typer
+import os
+import functools
+
+from coral_cli.commands._common import console, _ask_text, _ask_confirm, _ask_select
+
+_FRAMEWORK_CHOICES = ("camel", "langgraph", "crewai", "custom")
+_LANGUAGE_CHOICES = ("python",) # For now, we only support Python
+
+@functools.lru_cache(maxsize=None)
+def _questionary_choices(values: tuple) -> list:
+    """Build the questionary Choice objects for a choice tuple once and reuse them."""
+    import questionary
+    return [questionary.Choice(value) for value in values]
+
+def _dir_nonempty(path) -> bool:
+    """Return True if path is a directory with at least one entry, stopping at the first one."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except FileNotFoundError:
+        return False
+
+def run(framework: Optional[str], language: Optional[str], output_dir: str):
+    """Initialize a new Coral agent project"""
+    from coral_cli.templates import generate_template
+
+    console.print("[bold blue]🐠 Initializing new Coral agent project[/bold blue]")
+    
+    # If output directory not provided, prompt for it with default "src"
+    if not output_dir:
+        output_dir = _ask_text(
+            "Enter output directory:",
+            default="src"
+        )
+        if not output_dir: # Handle empty input
+            console.print("[bold red]Output directory cannot be empty.[/bold red]")
+            raise typer.Exit(1)
+
+    output_dir = Path(output_dir)
+    # Check if directory exists and is not empty
+    output_dir_nonempty = _dir_nonempty(output_dir)
+    if output_dir_nonempty:
+         confirm_overwrite = _ask_confirm(
+            f"Directory '{output_dir}' already exists and is not empty. Overwrite?",
+            default=False
+        )
+         if not confirm_overwrite:
+            console.print("[bold yellow]Initialization cancelled.[/bold yellow]")
+            raise typer.Exit()
+         # Consider cleaning the directory or handling merging if needed
+         # For now, we'll just proceed, potentially overwriting files
+    else:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # If framework not provided via command line, prompt for it
+    if not framework:
+        framework = _ask_select(
+            "Select a framework:",
+            choices=_questionary_choices(_FRAMEWORK_CHOICES),
+        )
+        if not framework: # Handle cancelled prompt
+             console.print("[bold red]Framework selection cancelled.[/bold red]")
+             raise typer.Exit(1)
+
+    # No point prompting while there is only one language to pick
+    if not language and len(_LANGUAGE_CHOICES) == 1:
+        language = _LANGUAGE_CHOICES[0]
+        console.print(f"[blue]Using {language}, the only language currently supported.[/blue]")
+    elif not language:
+        language = _ask_select(
+            "Select a language:",
+            choices=_questionary_choices(_LANGUAGE_CHOICES),
+        )
+        if not language: # Handle cancelled prompt
+             console.print("[bold red]Language selection cancelled.[/bold red]")
+             raise typer.Exit(1)
+
+    # Create combination key for template selection
+    template_key = f"{framework}-{language}"
+    
+    # For now, just print the selected options
+    console.print(
+        f"[bold green]Selected framework: {framework}\n"
+        f"Selected language: {language}\n"
+        f"Output directory: {output_dir}[/bold green]"
+    )
+    
+    # Generate the template
+    try:
+        output_path = Path(output_dir)
+        generate_template(framework, language, output_path)
+        console.print(
+            "[bold green]✅ Project initialized successfully![/bold green]\n"
+            f"[bold blue]Navigate to '{output_dir}' to see your project.[/bold blue]"
+        )
+    except ValueError as e:
+        console.print(f"[bold red]Error: {str(e)}[/bold red]")
+        console.print("[bold yellow]Available templates: camel-python[/bold yellow]")
+        raise typer.Exit(1)
+    except Exception as e:
+        console.print(f"[bold red]An unexpected error occurred: {str(e)}[/bold red]")
+        raise typer.Exit(1)
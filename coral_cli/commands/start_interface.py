@@ -0,0 +1,58 @@
+"""
+`coral start-interface`: run the user-facing CAMEL agent locally.
+"""
+from typing import Optional
+
+import typer
+import sys
+import os
+import asyncio
+
+from coral_cli.commands._common import console, _require_openai_key
+from coral_cli.commands._process import _run_attached, _child_env
+from coral_cli.interface_agent import get_interface_agent_script
+
+def run(agent_id: str, coral_url: str, openai_api_key: Optional[str]):
+    """Start a standard CAMEL AI agent to interact with the user and the Coral network."""
+    console.print(f"[bold blue]🐠 Starting User Interface Agent: {agent_id}[/bold blue]")
+
+    # --- Prerequisite Checks ---
+    console.print("Checking prerequisites...")
+    resolved_api_key = _require_openai_key(openai_api_key)
+
+    console.print("[green]Prerequisites check passed.[/green]")
+
+    # --- Generate Script ---
+    try:
+        interface_script = get_interface_agent_script(coral_url, agent_id)
+    except Exception as e:
+         console.print(f"[bold red]Error generating interface agent script: {e}[/bold red]")
+         raise typer.Exit(1)
+
+    # --- Execute Script Locally ---
+    console.print("Attempting to run interface agent locally...")
+    console.print("[bold yellow]Press Ctrl+C to stop the agent.[/bold yellow]")
+    try:
+        # Run using the same Python interpreter that's running the CLI. The script goes
+        # in via `-c` rather than a temp file; it can't be piped over stdin like the
+        # coralize-mcp wrapper because the agent's HumanToolkit reads the terminal.
+        cmd = [sys.executable, "-c", interface_script]
+        # Pass only the environment the agent needs, with the resolved API key
+        # Coral URL and Agent ID are embedded in the script now
+        env = _child_env(OPENAI_API_KEY=resolved_api_key)
+
+        if os.name == "posix":
+            # Nothing is left to do once the agent exits, so become it instead of
+            # keeping this interpreter alive just to wait; Ctrl+C goes straight to the agent
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.execve(sys.executable, cmd, env) # Only returns by raising OSError
+
+        # Elsewhere (Windows) stay attached to the terminal (the agent prompts the user);
+        # Ctrl+C gives it TERMINATE_GRACE_SECONDS to exit before it is killed
+        asyncio.run(_run_attached(cmd, env=env))
+
+    except KeyboardInterrupt:
+        console.print("\n[bold green]Interface agent stopped.[/bold green]")
+    except Exception as e:
+        console.print(f"[bold red]Error running script locally: {e}[/bold red]")
@@ -1,20 +1,20 @@
 import asyncio
 import os
+import sys
 import tempfile
 from pathlib import Path
 import subprocess
 from typing import Dict, List, Optional, Tuple
 import shutil
-import time
-import re # For parsing agent output
+import stat
+import string
+import random
+import functools
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import ast
 import json # For parsing potential JSON output from agent
-
-# GitPython for cloning
-try:
-    import git
-except ImportError:
-    print("Error: GitPython is not installed. Please run 'pip install GitPython'")
-    git = None # Set to None if import fails
+import hashlib
 
 # CAMEL AI components
 try:
@@ -25,33 +25,246 @@ except ImportError:
     print("Error: camel-ai library not found or incomplete.")
     print("Please ensure camel-ai is installed correctly (e.g., pip install 'camel-ai[web-tools]')")
     ChatAgent = ModelFactory = ModelPlatformType = ModelType = None # Set to None
+try:
+    from openai import AsyncOpenAI # Installed with camel-ai
+except ImportError:
+    AsyncOpenAI = None
 
 # Max context size (in characters) to feed to the generator agent
 MAX_CODE_CONTEXT_CHARS = 150000 # Example limit, depends on model
 MAX_TREE_CHARS = 200000 # Limit for file tree representation
+AGENT_STEP_ATTEMPTS = 3 # Tries per agent step before giving up
+AGENT_STEP_TIMEOUT_SECONDS = 180 # Per try; a full wrapper generation takes about a minute
+BUILD_LOG_TAIL_LINES = 200 # docker build output kept for diagnosing a failed build
+PIP_CACHE_MOUNT = "--mount=type=cache,target=/root/.cache/pip" # BuildKit cache for pip downloads/wheels
+# uv resolves and installs plain requirement lists much faster than pip; its static binary is
+# copied into the image, and the cache mount lives on another filesystem, so it copies, not links
+UV_IMAGE = "ghcr.io/astral-sh/uv:0.5.11"
+UV_PIP_INSTALL = "--mount=type=cache,target=/root/.cache/uv UV_LINK_MODE=copy uv pip install --system"
+REQUIREMENTS_INCLUDE_OPTIONS = ("-r", "-c", "--requirement", "--constraint") # Lines pulling in another requirements file
+ENTRY_POINT_MODEL = "gpt-4o-mini" # Picking entry points from a file tree is a small task
+DEFAULT_ENTRY_POINTS = ("main.py", "app.py", "agent.py", "run.py") # When the model gives no usable answer
+CODE_FENCE = "```python" # Opens the fenced code in agent replies (matched case-insensitively)
+# Directories never worth walking: VCS metadata, virtualenvs, caches and build output
+PRUNED_DIRS = frozenset({
+    '.git', '.venv', 'venv', 'node_modules', '__pycache__', '.tox',
+    'dist', 'build', '.mypy_cache', '.pytest_cache',
+})
+# .dockerignore for the clone when the repo has none: the same dirs stay out of the
+# build context docker uploads (dist/build are kept, a repo may ship those)
+DOCKERIGNORE = "".join(f"**/{name}\n" for name in sorted(PRUNED_DIRS - {'dist', 'build'}))
+# Agent replies from earlier runs, one file per (model, prompts) hash. The prompts embed
+# the repo's file tree / code context, so an unchanged repo skips both model calls.
+AGENT_CACHE_DIR = Path.home() / ".coral" / "agent_cache"
+# Shallow clones kept between runs, one per (repo_url, branch); a re-run only fetches the new tip
+REPO_CACHE_DIR = Path.home() / ".coral" / "repo_cache"
+
+# Dockerfile for a coralized GitHub repo; the blocks are the install steps
+# generate_dockerfile picks for the repo. $deps_block needs nothing from the repo but
+# self-contained dependency lists, so it runs before the source is copied in and
+# editing the code doesn't invalidate it; $project_block needs the whole tree.
+DOCKERFILE_TEMPLATE = string.Template("""# syntax=docker/dockerfile:1
+FROM python:3.10-slim
+
+WORKDIR /app
+
+# Install dependencies that don't need the repo's source (commands determined above)
+$deps_block
+
+# Copy the entire cloned repository content
+COPY . /app/
+
+# Install the project itself and anything that refers to its files
+$project_block
+
+# Copy the generated Coral wrapper into the root of /app
+COPY coral_wrapper.py /app/
+
+# Set environment variables (API key passed during run)
+# ENV OPENAI_API_KEY=...
+# ENV CORAL_SERVER_URL=...
+# ENV CORAL_AGENT_ID=...
+
+# Run the Coral wrapper (ensure it's executable if needed: RUN chmod +x /app/coral_wrapper.py)
+# Use python -u for unbuffered output
+CMD ["python", "-u", "/app/coral_wrapper.py"]
+""")
 
 # --- Helper Function ---
-async def _run_camel_agent_step(system_prompt: str, user_prompt: str, api_key: str, model_type = ModelType.GPT_4O) -> Optional[str]:
-    """Helper to run a single step of a temporary CAMEL agent."""
-    if not ChatAgent: return None # Guard against import failure
+def _agent_cache_path(model_type, system_prompt: str, user_prompt: str) -> Path:
+    key = hashlib.sha256("\0".join((str(model_type), system_prompt, user_prompt)).encode()).hexdigest()
+    return AGENT_CACHE_DIR / f"{key}.txt"
+
+def _read_cached_reply(cache_path: Path) -> Optional[str]:
     try:
-        agent_model = ModelFactory.create(
-            model_platform=ModelPlatformType.OPENAI,
-            model_type=model_type,
-            api_key=api_key,
-            model_config_dict={"temperature": 0.1},
-        )
+        return cache_path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+def _write_cached_reply(cache_path: Path, reply: str) -> None:
+    try:
+        AGENT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write aside and rename, so a concurrent run never reads half a reply
+        fd, tmp_path = tempfile.mkstemp(dir=AGENT_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(reply)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass # Caching is an optimisation only
+
+def _has_vcs_dependency(path: Path, _seen: Optional[set] = None) -> bool:
+    """
+    Whether a dependency file may need git at install time (git+ URLs, Poetry `git =` deps).
+    For requirements files, `-r`/`-c` includes are followed, relative to the including file.
+    """
+    try:
+        text = path.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return True # Can't tell, so keep git
+    if "git+" in text or "git =" in text or "git=" in text:
+        return True
+    if path.name in ("setup.py", "pyproject.toml"):
+        return False
+    seen = _seen if _seen is not None else set()
+    seen.add(path.resolve())
+    for line in text.splitlines():
+        line = line.split(" #", 1)[0].strip()
+        for option in REQUIREMENTS_INCLUDE_OPTIONS:
+            if line.startswith(option):
+                target = line[len(option):].lstrip(" =")
+                break
+        else:
+            continue
+        if not target or "://" in target:
+            return True # Remote or malformed include: can't inspect it, so keep git
+        included = (path.parent / target).resolve()
+        if included not in seen and _has_vcs_dependency(included, seen):
+            return True
+    return False
+
+def _requirements_are_self_contained(path: Path) -> bool:
+    """
+    Whether a requirements file can be installed on its own: no includes, editables or
+    local paths, which would need the rest of the repo copied in first.
+    """
+    try:
+        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return False
+    for line in lines:
+        line = line.split(" #", 1)[0].strip()
+        if line.startswith(("-r", "-c", "-e", "--requirement", "--constraint", "--editable", ".", "/", "~")) \
+                or "file:" in line:
+            return False
+    return True
+
+def _clear_readonly_and_retry(func, path, exc):
+    """shutil.rmtree onexc handler: git leaves its object files read-only, which Windows refuses to delete."""
+    if not isinstance(exc, PermissionError):
+        raise exc
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+def _summarize_py(source: str) -> Optional[str]:
+    """Python source with every function body reduced to its docstring and `...`; None if it doesn't parse."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            docstring = ast.get_docstring(node, clean=False)
+            node.body = ([ast.Expr(ast.Constant(docstring))] if docstring else []) + [ast.Expr(ast.Constant(...))]
+    return ast.unparse(tree)
+
+@functools.lru_cache(maxsize=None)
+def _get_agent_model(model_type, api_key: str):
+    """
+    One model backend per (model_type, api_key), shared by every agent step so the
+    OpenAI client (and its open HTTPS connections) is reused between calls.
+    """
+    return ModelFactory.create(
+        model_platform=ModelPlatformType.OPENAI,
+        model_type=model_type,
+        api_key=api_key,
+        model_config_dict={"temperature": 0.1},
+    )
+
+async def _cached_step(cache_path: Path, call, parse, use_cache: bool = True):
+    """
+    parse(reply) for one model step, or None. The reply comes from the on-disk cache if
+    present, else from call() (a coroutine function returning the reply text or None),
+    retried with backoff. Only replies that parse are cached, so an unusable one is
+    never replayed; use_cache=False skips the cache both ways.
+    """
+    if use_cache:
+        cached = await asyncio.to_thread(_read_cached_reply, cache_path)
+        if cached is not None:
+            parsed = parse(cached)
+            if parsed is not None:
+                print(f"Using cached agent response ({cache_path}; delete it to ask the model again).")
+                return parsed
+            print("Cached agent response is unusable, asking the model again.")
+            cache_path.unlink(missing_ok=True)
+    for attempt in range(1, AGENT_STEP_ATTEMPTS + 1):
+        try:
+            reply = await asyncio.wait_for(call(), AGENT_STEP_TIMEOUT_SECONDS)
+            if reply is None:
+                print("Warning: Agent step returned no message.")
+                return None
+            parsed = parse(reply)
+            if parsed is not None and use_cache:
+                await asyncio.to_thread(_write_cached_reply, cache_path, reply)
+            return parsed
+        except Exception as e:
+            # CAMEL wraps the OpenAI errors, so a transient 429/5xx/timeout can't always be
+            # told apart from a permanent one here; a short bounded retry covers both cheaply
+            if isinstance(e, asyncio.TimeoutError):
+                e = f"no reply within {AGENT_STEP_TIMEOUT_SECONDS}s"
+            if attempt == AGENT_STEP_ATTEMPTS:
+                print(f"Error during agent step: {e}")
+                return None
+            delay = 2 ** attempt + random.random()
+            print(f"Warning: Agent step failed ({e}), retrying in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+
+async def _run_camel_agent_step(system_prompt: str, user_prompt: str, api_key: str, model_type = ModelType.GPT_4O,
+                                parse = lambda reply: reply, use_cache: bool = True):
+    """Helper to run a single step of a temporary CAMEL agent; returns parse(reply) (see _cached_step)."""
+    if not ChatAgent: return None # Guard against import failure
+
+    async def _call():
+        agent_model = _get_agent_model(model_type, api_key)
+        # The agent itself is per-call: its system prompt embeds this repo's tree/context
         agent = ChatAgent(system_message=system_prompt, model=agent_model)
         agent.reset()
         response = await agent.astep(user_prompt)
-        if response and response.msgs:
-            return response.msgs[0].content
-        else:
-            print("Warning: CAMEL agent step returned no message.")
-            return None
-    except Exception as e:
-        print(f"Error during CAMEL agent step: {e}")
-        return None
+        return response.msgs[0].content if response and response.msgs else None
+
+    return await _cached_step(_agent_cache_path(model_type, system_prompt, user_prompt), _call, parse, use_cache)
+
+@functools.lru_cache(maxsize=None)
+def _get_openai_client(api_key: str):
+    return AsyncOpenAI(api_key=api_key)
+
+async def _run_json_step(system_prompt: str, user_prompt: str, api_key: str, model: str,
+                         parse = lambda reply: reply, use_cache: bool = True):
+    """
+    One-shot chat completion in JSON mode, straight through the OpenAI client: for
+    structured answers the CAMEL agent's conversation bookkeeping adds nothing.
+    """
+    if not AsyncOpenAI: return None # Guard against import failure
+
+    async def _call():
+        response = await _get_openai_client(api_key).chat.completions.create(
+            model=model,
+            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+            response_format={"type": "json_object"},
+            temperature=0.1,
+        )
+        return response.choices[0].message.content if response.choices else None
+
+    return await _cached_step(_agent_cache_path(f"{model}:json", system_prompt, user_prompt), _call, parse, use_cache)
 
 class GitHubCoralizer:
     def __init__(self,
@@ -59,9 +272,8 @@ class GitHubCoralizer:
                  coral_server_url: str,
                  agent_id: str,
                  branch: Optional[str] = None,
-                 openai_api_key: Optional[str] = None):
-        if not git:
-            raise ImportError("GitPython is required but not installed.")
+                 openai_api_key: Optional[str] = None,
+                 use_cache: bool = True):
         if not ChatAgent:
              raise ImportError("camel-ai library is required but not installed/imported.")
 
@@ -69,26 +281,84 @@ class GitHubCoralizer:
         self.coral_server_url = coral_server_url
         self.agent_id = agent_id
         self.branch = branch
+        self.use_cache = use_cache # False: always ask the model, and don't store its replies
         self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it.")
         self.temp_dir = None
 
+    async def _run_git(self, *args: str) -> None:
+        """Runs `git *args` without blocking the event loop; RuntimeError with git's stderr on failure."""
+        proc = await asyncio.create_subprocess_exec(
+            "git", *args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            command = args[2] if args[0] == "-C" else args[0] # The subcommand, past any `-C <dir>`
+            raise RuntimeError(f"git {command} failed: {stderr.decode(errors='replace').strip()}")
+
+    async def _git_clone(self, repo_path: Path, *options: str) -> None:
+        """Runs `git clone` of the remote into repo_path."""
+        if self.branch:
+            options += ("--branch", self.branch)
+        await self._run_git("clone", *options, "--", self.repo_url, str(repo_path))
+
+    async def _clone_remote(self, repo_path: Path) -> None:
+        """Clones the remote into the (empty) repo_path."""
+        try:
+            # Only the working tree is ever read, so fetch just the tip commit of one branch
+            await self._git_clone(repo_path, "--depth=1", "--single-branch", "--no-tags")
+        except RuntimeError:
+            # Some remotes (e.g. dumb HTTP) can't serve shallow clones; retry with a full one
+            print("Shallow clone failed, retrying with a full clone...")
+            shutil.rmtree(repo_path, ignore_errors=True)
+            repo_path.mkdir(parents=True)
+            await self._git_clone(repo_path)
+
+    async def _update_repo_cache(self) -> Optional[Path]:
+        """
+        Brings the cached clone of (repo_url, branch) up to the remote tip, cloning it on
+        first use. Returns its path, or None if the cache can't be used this time.
+        """
+        key = hashlib.sha256(f"{self.repo_url}|{self.branch or 'HEAD'}".encode()).hexdigest()[:16]
+        cache_path = REPO_CACHE_DIR / key
+        try:
+            if (cache_path / ".git").is_dir():
+                try:
+                    # Only what changed since the last run crosses the network
+                    await self._run_git("-C", str(cache_path), "fetch", "--depth=1", "--no-tags", "origin", self.branch or "HEAD")
+                    await self._run_git("-C", str(cache_path), "reset", "--hard", "--quiet", "FETCH_HEAD")
+                    await self._run_git("-C", str(cache_path), "clean", "-fdxq")
+                    return cache_path
+                except RuntimeError as e:
+                    print(f"Warning: Could not update cached clone, re-cloning ({e})")
+            shutil.rmtree(cache_path, ignore_errors=True) # Stale or interrupted clone
+            await self._clone_remote(cache_path) # A git error here is the remote's, so it propagates
+            return cache_path
+        except OSError as e:
+            print(f"Warning: Repository cache unavailable, cloning directly ({e})")
+            return None
+
     async def _clone_repo(self) -> Path:
         """Clones the repository into a temporary directory."""
         self.temp_dir = tempfile.mkdtemp(prefix="coral_git_")
         repo_path = Path(self.temp_dir)
         print(f"Cloning {self.repo_url} into {repo_path}...")
         try:
-            clone_options = {}
-            if self.branch:
-                clone_options['branch'] = self.branch
-            git.Repo.clone_from(self.repo_url, repo_path, **clone_options)
+            cache_path = await self._update_repo_cache()
+            if cache_path is not None:
+                # Local clone of the cache: objects are hardlinked and nothing crosses the
+                # network, while callers still get a private copy they may move or modify
+                await self._run_git("clone", "--quiet", "--", str(cache_path), str(repo_path))
+                # Point origin back at the real remote; this checkout may end up in --output-dir
+                await self._run_git("-C", str(repo_path), "remote", "set-url", "origin", self.repo_url)
+            else:
+                await self._clone_remote(repo_path)
             print("Repository cloned successfully.")
             return repo_path
-        except git.GitCommandError as e:
+        except RuntimeError:
             self.cleanup()
-            raise RuntimeError(f"Failed to clone repository: {e.stderr}") from e
+            raise
         except Exception as e:
             self.cleanup()
             raise RuntimeError(f"An unexpected error occurred during cloning: {e}") from e
@@ -96,26 +366,41 @@ class GitHubCoralizer:
     def _get_file_tree(self, repo_path: Path) -> str:
         """Generates a simplified directory tree structure, prioritizing Python files."""
         print("Generating file tree...")
-        tree_str = ""
         entries = []
-        for item in repo_path.rglob('*'):
-            if '.git' in item.parts:
-                continue # Skip .git contents
+        total_chars = 0 # Running length of "\n".join(entries), so the walk can stop at the limit
 
-            depth = len(item.relative_to(repo_path).parts) -1
+        def _walk(dir_path: str, depth: int) -> bool:
+            """Depth-first scandir walk appending to entries; False once MAX_TREE_CHARS is reached."""
+            nonlocal total_chars
             indent = '  ' * depth
-            if item.is_dir():
-                entries.append(f"{indent}└─ {item.name}/")
-            elif item.is_file():
+            try:
+                with os.scandir(dir_path) as it:
+                    children = list(it)
+            except OSError:
+                return True # Unreadable directory: skip it
+            for entry in children:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir and entry.name in PRUNED_DIRS:
+                    continue # Skip the whole subtree
+                if is_dir:
+                    line = f"{indent}└─ {entry.name}/"
                 # Optional: Prioritize showing .py files, requirements, etc.
-                if item.name.endswith('.py') or item.name in ['requirements.txt', 'pyproject.toml', 'setup.py']:
-                     entries.append(f"{indent}└─ {item.name}")
-                # else: # Option to hide non-essential files
-                #     entries.append(f"{indent}└─ (other file)") # Placeholder
-
+                elif entry.name.endswith('.py') or entry.name in ('requirements.txt', 'pyproject.toml', 'setup.py'):
+                    line = f"{indent}└─ {entry.name}"
+                else:
+                    continue
+                entries.append(line)
+                total_chars += len(line) + 1
+                if total_chars > MAX_TREE_CHARS:
+                    return False
+                if is_dir and not _walk(entry.path, depth + 1):
+                    return False
+            return True
+
+        complete = _walk(str(repo_path), 0)
         tree_str = "\n".join(entries)
 
-        if len(tree_str) > MAX_TREE_CHARS:
+        if not complete:
             print(f"Warning: File tree truncated at {MAX_TREE_CHARS} characters.")
             tree_str = tree_str[:MAX_TREE_CHARS] + "\n..."
 
@@ -123,8 +408,8 @@ class GitHubCoralizer:
         return tree_str
 
     async def _identify_entry_points_with_camel_agent(self, file_tree: str) -> List[str]:
-        """Uses a CAMEL agent to suggest potential entry point files based on the tree."""
-        print("Asking CAMEL agent to identify potential entry points...")
+        """Asks the model to suggest potential entry point files based on the tree."""
+        print("Asking the model to identify potential entry points...")
         system_prompt = """
 You are an expert code analyzer. Your task is to identify the most likely main entry point Python files for an application or agent based on the provided file structure. Look for common names like `main.py`, `app.py`, `run.py`, `agent.py`, or files located at the root or in relevant subdirectories (e.g., `src/`, `app/`).
 
@@ -133,75 +418,90 @@ Analyze the following file tree:
 {file_tree}
 ```
 
-List the top 3-5 most probable Python entry point file paths relative to the repository root. Output the result as a JSON list of strings. Example: ["main.py", "src/agent.py", "app/run.py"]
-Respond ONLY with the JSON list.
+List the top 3-5 most probable Python entry point file paths relative to the repository root. Output the result as a JSON object with an "entry_points" list of strings. Example: {"entry_points": ["main.py", "src/agent.py", "app/run.py"]}
+Respond ONLY with the JSON object.
 """
-        user_prompt = f"Identify the most likely Python entry point files from this file tree:\n{file_tree}\nRespond only with a JSON list of relative file paths."
+        user_prompt = f"Identify the most likely Python entry point files from this file tree:\n{file_tree}\nRespond only with a JSON object listing the relative file paths under \"entry_points\"."
 
-        response = await _run_camel_agent_step(system_prompt, user_prompt, self.openai_api_key, ModelType.GPT_4O) # Use cheaper model for analysis
+        def _parse(response: str) -> Optional[List[str]]:
+            try:
+                candidate_files = json.loads(response).get("entry_points")
+            except (json.JSONDecodeError, AttributeError):
+                candidate_files = None
+            if isinstance(candidate_files, list) and candidate_files and all(isinstance(f, str) for f in candidate_files):
+                return candidate_files
+            print(f"Warning: Agent response did not list entry points: {response}")
+            return None
 
-        if not response:
-            print("Warning: Agent failed to identify entry points. Falling back to default candidates.")
-            return ["main.py", "app.py", "agent.py", "run.py"] # Default fallback
+        # Use cheaper (and faster) model for analysis; JSON mode guarantees the reply is JSON
+        candidate_files = await _run_json_step(system_prompt, user_prompt, self.openai_api_key, ENTRY_POINT_MODEL,
+                                               parse=_parse, use_cache=self.use_cache)
 
-        try:
-            # Attempt to parse JSON list from response
-            # Clean potential markdown formatting
-            if response.startswith("```json"):
-                 response = response.split("```json\n", 1)[1].split("\n```", 1)[0]
-            elif response.startswith("```"):
-                 response = response.split("```\n", 1)[1].split("\n```", 1)[0]
-
-            candidate_files = json.loads(response)
-            if isinstance(candidate_files, list) and all(isinstance(f, str) for f in candidate_files):
-                 print(f"Agent suggested entry points: {candidate_files}")
-                 return candidate_files
-            else:
-                 print(f"Warning: Agent response was not a valid JSON list of strings: {response}")
-                 return ["main.py", "app.py", "agent.py", "run.py"]
-        except json.JSONDecodeError:
-            print(f"Warning: Could not parse JSON response from agent: {response}")
-            # Attempt simple parsing if it looks like a plain list string
-            if response.startswith('[') and response.endswith(']'):
-                 try:
-                     # Very basic parsing, might fail
-                     items = response.strip('[]').split(',')
-                     candidates = [item.strip().strip('\'"') for item in items if item.strip()]
-                     if candidates:
-                         print(f"Agent suggested entry points (parsed from string): {candidates}")
-                         return candidates
-                 except Exception:
-                     pass # Ignore parsing errors here
-            return ["main.py", "app.py", "agent.py", "run.py"] # Fallback
+        if not candidate_files:
+            print("Warning: Agent failed to identify entry points. Falling back to default candidates.")
+            return list(DEFAULT_ENTRY_POINTS)
+        print(f"Agent suggested entry points: {candidate_files}")
+        return candidate_files
 
     def _get_focused_code_context(self, repo_path: Path, candidate_files: List[str]) -> str:
         """Reads content only from the candidate files."""
         print(f"Reading content from candidate files: {candidate_files}")
-        code_context = ""
+        parts = [] # Headers and file contents, joined once at the end
         total_chars = 0
         files_read_count = 0
 
-        for filename in candidate_files:
+        def _read(filename: str):
             # Ensure filename is treated as relative path from repo_path
             filepath = repo_path / filename.strip() # Normalize path separators if needed
-            if filepath.is_file():
-                try:
-                    content = filepath.read_text(encoding='utf-8', errors='ignore')
-                    header = f"\n--- File: {filename} ---\n"
-                    if total_chars + len(content) + len(header) <= MAX_CODE_CONTEXT_CHARS:
-                        code_context += header
-                        code_context += content
-                        total_chars += len(content) + len(header)
-                        files_read_count += 1
-                    else:
-                        print(f"Warning: Skipping content of {filename} due to context limit.")
-                        # Optionally break here if hitting the limit is critical
-                        # break
-                except Exception as e:
-                    print(f"Warning: Could not read candidate file {filepath}: {e}")
-            else:
+            if not filepath.is_file():
+                return filepath, None
+            try:
+                # A file longer than the whole budget is skipped below anyway, so never read
+                # more than one char past it (keeps e.g. a vendored 50 MB file out of memory)
+                with open(filepath, encoding='utf-8', errors='ignore') as f:
+                    return filepath, f.read(MAX_CODE_CONTEXT_CHARS + 1)
+            except Exception as e:
+                return filepath, e
+
+        # The agent may name one file twice ("main.py", "./main.py"); keep the first mention
+        unique_files = {}
+        for filename in candidate_files:
+            unique_files.setdefault(os.path.normpath(filename.strip()), filename)
+        candidate_files = list(unique_files.values())
+
+        # Read the candidates concurrently (each read is a blocking open/read), then
+        # fill the budget from the results in the agent's priority order
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(candidate_files)))) as executor:
+            results = list(executor.map(_read, candidate_files))
+
+        for filename, (filepath, content) in zip(candidate_files, results):
+            if content is None:
                  print(f"Warning: Candidate file not found: {filepath}")
+            elif isinstance(content, Exception):
+                print(f"Warning: Could not read candidate file {filepath}: {content}")
+            else:
+                header = f"\n--- File: {filename} ---\n"
+                if total_chars + len(content) + len(header) <= MAX_CODE_CONTEXT_CHARS:
+                    parts.append(header)
+                    parts.append(content)
+                    total_chars += len(content) + len(header)
+                    files_read_count += 1
+                    continue
+                # Doesn't fit whole: fall back to the file's outline (imports, classes,
+                # signatures, module-level code) so the agent still sees its shape
+                summary = _summarize_py(content) if filename.strip().endswith('.py') else None
+                header = f"\n--- File: {filename} (function bodies omitted) ---\n"
+                if summary is not None and total_chars + len(summary) + len(header) <= MAX_CODE_CONTEXT_CHARS:
+                    parts.append(header)
+                    parts.append(summary)
+                    total_chars += len(summary) + len(header)
+                    files_read_count += 1
+                else:
+                    print(f"Warning: Skipping content of {filename} due to context limit.")
+                    # Optionally break here if hitting the limit is critical
+                    # break
 
+        code_context = "".join(parts)
         print(f"Read {files_read_count} candidate files ({total_chars} chars) for focused context.")
         if not code_context:
              print("Warning: No content could be read from candidate files.")
@@ -209,10 +509,12 @@ Respond ONLY with the JSON list.
 
     def _parse_generated_code(self, response_content: str) -> Optional[str]:
         """Extracts Python code block from the agent's response."""
-        # Look for ```python ... ``` code blocks
-        match = re.search(r"```python\s*([\s\S]+?)\s*```", response_content, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+        # Look for ```python ... ``` code blocks (plain substring scans, no regex)
+        start = response_content.lower().find(CODE_FENCE)
+        end = response_content.find("```", start + len(CODE_FENCE)) if start >= 0 else -1
+        code = response_content[start + len(CODE_FENCE):end].strip() if end >= 0 else ""
+        if code:
+            return code
         else:
             # Fallback only if it looks like code
             if "import asyncio" in response_content and "MCPToolkit" in response_content:
@@ -268,13 +570,12 @@ Generate the `coral_wrapper.py` content based *only* on the requirements and the
 """
         user_prompt = "Generate the Python code for the `coral_wrapper.py` script based on the requirements and context provided in the system message."
 
-        response = await _run_camel_agent_step(system_prompt, user_prompt, self.openai_api_key, ModelType.GPT_4O) # Use capable model
-
-        if response:
-            return self._parse_generated_code(response)
-        else:
-            print("Error: Wrapper generation agent failed to respond.")
-            return None
+        # Use capable model; the reply is only cached once a code block parses out of it
+        wrapper = await _run_camel_agent_step(system_prompt, user_prompt, self.openai_api_key, ModelType.GPT_4O,
+                                              parse=self._parse_generated_code, use_cache=self.use_cache)
+        if wrapper is None:
+            print("Error: Wrapper generation agent gave no usable response.")
+        return wrapper
 
     def generate_dockerfile(self, repo_path: Path) -> str:
         """Generates a Dockerfile for the GitHub repo."""
@@ -283,76 +584,56 @@ Generate the `coral_wrapper.py` content based *only* on the requirements and the
         print("Generating Dockerfile...")
 
         # --- Dependency Detection ---
-        requirements_content = ""
-        has_req_txt = (repo_path / "requirements.txt").exists()
-        has_setup_py = (repo_path / "setup.py").exists()
-        has_pyproject = (repo_path / "pyproject.toml").exists() # Could be poetry, pdm, etc.
+        # One listing of the repo root answers every probe below (no stat per name)
+        with os.scandir(repo_path) as it:
+            root_entries = {entry.name: entry for entry in it}
+        has_req_txt = "requirements.txt" in root_entries
+        has_setup_py = "setup.py" in root_entries
+        has_pyproject = "pyproject.toml" in root_entries # Could be poetry, pdm, etc.
 
         install_commands = []
-        # Base dependencies
-        install_commands.append("RUN apt-get update && apt-get install -y --no-install-recommends git && rm -rf /var/lib/apt/lists/*")
-        install_commands.append("RUN pip install --no-cache-dir --upgrade pip")
-
+        # Base dependencies; git (and its apt layer) only when a dependency is installed from a repo
+        if any(_has_vcs_dependency(repo_path / name) for name in ("requirements.txt", "setup.py", "pyproject.toml") if name in root_entries):
+            install_commands.append("RUN apt-get update && apt-get install -y --no-install-recommends git && rm -rf /var/lib/apt/lists/*")
+        install_commands.append(f"COPY --from={UV_IMAGE} /uv /usr/local/bin/uv")
+        if has_setup_py or has_pyproject: # Only these still install through pip
+            install_commands.append(f"RUN {PIP_CACHE_MOUNT} pip install --upgrade pip")
+
+        project_commands = [] # Run after `COPY . /app/`
         if has_req_txt:
             print("Found requirements.txt.")
-            install_commands.append("COPY requirements.txt .")
-            install_commands.append("RUN pip install --no-cache-dir -r requirements.txt")
+            if _requirements_are_self_contained(repo_path / "requirements.txt"):
+                install_commands.append("COPY requirements.txt .")
+                install_commands.append(f"RUN {UV_PIP_INSTALL} -r requirements.txt")
+            else: # Includes, -e . or local paths: install once the whole tree is there
+                project_commands.append(f"RUN {UV_PIP_INSTALL} -r requirements.txt")
         if has_setup_py:
              print("Found setup.py. Adding 'pip install .'")
-             # Copy necessary files for setup.py before running install
-             install_commands.append("COPY setup.py .")
-             # Heuristic: copy common config files if they exist
-             if (repo_path / "setup.cfg").exists(): install_commands.append("COPY setup.cfg .")
-             if (repo_path / "MANIFEST.in").exists(): install_commands.append("COPY MANIFEST.in .")
-             # Heuristic: copy source directory if setup.py likely uses find_packages()
-             # This is tricky - find the likely source dir name (often repo name or 'src')
-             repo_name_dir = repo_path / repo_path.name
-             src_dir = repo_path / "src"
-             if repo_name_dir.is_dir(): install_commands.append(f"COPY {repo_path.name} ./{repo_path.name}")
-             elif src_dir.is_dir(): install_commands.append("COPY src ./src")
-             install_commands.append("RUN pip install --no-cache-dir .") # Install the package itself
+             # setup.py may read any file (README, version module, package dirs), so the
+             # package is only installed once the whole tree has been copied in
+             project_commands.append(f"RUN {PIP_CACHE_MOUNT} pip install .") # Install the package itself
         if has_pyproject:
              print("Found pyproject.toml. Attempting Poetry install (experimental).")
-             # This assumes Poetry is used and installs *all* dependencies
-             install_commands.append("COPY pyproject.toml .")
-             install_commands.append("COPY poetry.lock .") # Copy lock file if it exists
-             install_commands.append("RUN pip install --no-cache-dir poetry")
-             install_commands.append("RUN poetry config virtualenvs.create false && poetry install --no-dev --no-interaction --no-ansi")
+             # This assumes Poetry is used and installs *all* dependencies; runs on the full
+             # tree, as the project itself (readme, packages) is installed too
+             install_commands.append(f"RUN {PIP_CACHE_MOUNT} pip install poetry") # Needs nothing from the repo
+             project_commands.append("RUN --mount=type=cache,target=/root/.cache/pypoetry poetry config virtualenvs.create false && poetry install --only main --no-interaction --no-ansi")
+             # --only main: Poetry 2 dropped --no-dev (`pip install poetry` gets the latest)
              # Note: This installs poetry globally in the image first.
 
-        if not install_commands:
+        if not has_req_txt and not has_setup_py and not has_pyproject:
              print("Warning: No standard dependency file found (requirements.txt, setup.py, pyproject.toml). Only installing camel-ai.")
              install_commands.append("# Add necessary pip installs here if needed")
 
-        # Ensure camel-ai is installed regardless
-        install_commands.append("RUN pip install --no-cache-dir 'camel-ai[web-tools]>=0.2.0,<0.3.0'") # Match pyproject
-
-        requirements_content = "\n".join(install_commands)
+        # Ensure camel-ai is installed regardless; last, as before, so its pins win over the repo's
+        camel_install = f"RUN {UV_PIP_INSTALL} 'camel-ai[web-tools]>=0.2.0,<0.3.0'" # Match pyproject
+        (project_commands if project_commands else install_commands).append(camel_install)
 
         # --- Dockerfile Content ---
-        dockerfile = f"""FROM python:3.10-slim
-
-WORKDIR /app
-
-# Copy the entire cloned repository content first
-# This allows subsequent COPY/RUN commands to work relative to /app
-COPY . /app/
-
-# Copy the generated Coral wrapper into the root of /app
-COPY coral_wrapper.py /app/
-
-# Install dependencies (commands determined above)
-{requirements_content}
-
-# Set environment variables (API key passed during run)
-# ENV OPENAI_API_KEY=...
-# ENV CORAL_SERVER_URL=...
-# ENV CORAL_AGENT_ID=...
-
-# Run the Coral wrapper (ensure it's executable if needed: RUN chmod +x /app/coral_wrapper.py)
-# Use python -u for unbuffered output
-CMD ["python", "-u", "/app/coral_wrapper.py"]
-"""
+        dockerfile = DOCKERFILE_TEMPLATE.substitute(
+            deps_block="\n".join(install_commands),
+            project_block="\n".join(project_commands) or "# (nothing to install from the source tree)",
+        )
         print("Dockerfile generated.")
         return dockerfile
 
@@ -361,27 +642,31 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
         repo_path = await self._clone_repo()
         if not repo_path: return None, None, None
 
+        # The Dockerfile only needs the cloned tree, so it is generated on a worker
+        # thread while the agent steps below run
+        dockerfile_task = asyncio.create_task(asyncio.to_thread(self.generate_dockerfile, repo_path))
         try:
+            # Disk-bound steps run on worker threads to keep the event loop free
             # Step 1: Identify entry points
-            file_tree = self._get_file_tree(repo_path)
+            file_tree = await asyncio.to_thread(self._get_file_tree, repo_path)
             candidate_files = await self._identify_entry_points_with_camel_agent(file_tree)
 
             # Step 2: Get focused context
-            focused_context = self._get_focused_code_context(repo_path, candidate_files)
+            focused_context = await asyncio.to_thread(self._get_focused_code_context, repo_path, candidate_files)
 
             # Step 3: Generate wrapper using focused context
             wrapper = await self._generate_wrapper_with_camel_agent(focused_context, file_tree)
+            dockerfile = await dockerfile_task
             if not wrapper:
                  print("Error: Failed to generate wrapper code using CAMEL agent.")
                  self.cleanup()
                  return None, None, None # Indicate failure
 
-            # Step 4: Generate Dockerfile
-            dockerfile = self.generate_dockerfile(repo_path)
-
             return wrapper, dockerfile, repo_path
         except Exception as e:
             print(f"Error during coralization process: {e}")
+            # Let the Dockerfile probes finish before their tree is removed
+            await asyncio.gather(dockerfile_task, return_exceptions=True)
             self.cleanup()
             raise e
 
@@ -398,10 +683,11 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
         dockerfile_path = repo_path / "Dockerfile" # Dockerfile needs to be at root of context
 
         try:
-            with open(wrapper_path, "w") as f:
-                f.write(wrapper)
-            with open(dockerfile_path, "w") as f:
-                f.write(dockerfile)
+            wrapper_path.write_text(wrapper, encoding="utf-8")
+            dockerfile_path.write_text(dockerfile, encoding="utf-8")
+            dockerignore_path = repo_path / ".dockerignore"
+            if not dockerignore_path.exists(): # The repo's own rules win if it has them
+                dockerignore_path.write_text(DOCKERIGNORE, encoding="utf-8")
         except IOError as e:
             print(f"[bold red]Error writing generated files: {e}[/bold red]")
             self.cleanup()
@@ -411,14 +697,24 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
         image_name = f"github-coralizer-{self.agent_id.lower().replace(' ', '-')}"
         print(f"Building Docker image: {image_name} from context {repo_path}...")
         try:
-            build_process = subprocess.run(
+            # Stream the build log as it arrives instead of holding all of it until
+            # the build ends; only the tail is kept, for the error checks below
+            build_process = subprocess.Popen(
                 ["docker", "build", "-t", image_name, "."], # Use '.' as context path relative to cwd
                 cwd=repo_path, # Execute docker build FROM the repo path
-                capture_output=True, text=True, check=False
+                env={**os.environ, "DOCKER_BUILDKIT": "1"}, # Cache mounts need BuildKit (opt-in before Docker 23)
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
             )
-
-            if build_process.returncode != 0:
-                if "permission denied" in build_process.stderr.lower() and "docker.sock" in build_process.stderr.lower():
+            build_tail = collections.deque(maxlen=BUILD_LOG_TAIL_LINES)
+            with build_process.stdout:
+                for line in build_process.stdout:
+                    print(line, end="")
+                    build_tail.append(line)
+            build_returncode = build_process.wait()
+
+            if build_returncode != 0:
+                build_stderr = "".join(build_tail).lower() # Lowercase once for both checks
+                if "permission denied" in build_stderr and "docker.sock" in build_stderr:
                      print("[bold red]Docker Permission Error Detected![/bold red]")
                      print("[bold yellow]The current user does not have permission to access the Docker daemon socket.[/bold yellow]")
                      print("[bold yellow]On Linux, try adding your user to the 'docker' group:[/bold yellow]")
@@ -426,8 +722,8 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
                      print("  2. Log out and log back in, or run: [cyan]newgrp docker[/cyan] in your terminal.")
                      print("[bold yellow]Then, try running the coral command again.[/bold yellow]")
                 else:
-                    print(f"[bold red]Error building Docker image (Return Code: {build_process.returncode}):[/bold red]")
-                    print(build_process.stderr)
+                    # The log itself was already printed above
+                    print(f"[bold red]Error building Docker image (Return Code: {build_returncode}).[/bold red]")
                 self.cleanup()
                 return # Stop if build fails
 
@@ -449,6 +745,14 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
                 image_name
             ]
             print(f"Executing: {' '.join(run_cmd)}") # Show the command being run
+            if os.name == "posix":
+                # The image now holds everything the agent needs and nothing is left to do
+                # once the container exits, so drop the clone and become `docker run`
+                # (it forwards Ctrl+C to the container and --rm removes it)
+                self.cleanup()
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os.execvp("docker", run_cmd) # Only returns by raising OSError
             subprocess.run(run_cmd, check=True) # check=True will raise CalledProcessError if run fails
 
         except FileNotFoundError:
@@ -460,40 +764,29 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
         except KeyboardInterrupt:
             print("\n[bold yellow]Stopping Docker container...[/bold yellow]")
             stop_cmd = ["docker", "stop", container_name]
-            subprocess.run(stop_cmd, capture_output=True) # Attempt to stop
+            subprocess.run(stop_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) # Attempt to stop
             print("[bold green]Container stop command issued.[/bold green]")
         finally:
             # --- Important: Clean up the temporary directory ---
             self.cleanup()
 
-    def cleanup(self):
-        """Removes the temporary directory used for cloning."""
-        if self.temp_dir and Path(self.temp_dir).exists():
-            try:
-                # Add error handling for Windows file locking issues
-                retries = 3
-                delay = 1
-                while retries > 0:
-                    try:
-                        shutil.rmtree(self.temp_dir)
-                        print(f"Cleaned up temporary directory: {self.temp_dir}")
-                        self.temp_dir = None
-                        break # Success
-                    except OSError as e:
-                        # Specifically catch permission errors which might happen on Windows
-                        if isinstance(e, PermissionError) or "Access is denied" in str(e):
-                             retries -= 1
-                             if retries == 0:
-                                 print(f"Warning: Failed to clean up temporary directory {self.temp_dir} after multiple retries: {e}")
-                             else:
-                                 print(f"Warning: Permission error cleaning up {self.temp_dir}, retrying in {delay}s...")
-                                 time.sleep(delay)
-                        else:
-                             # Re-raise other OS errors immediately
-                             raise e
-            except Exception as e:
-                print(f"Warning: Failed to clean up temporary directory {self.temp_dir}: {e}")
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+        return False
 
-    def __del__(self):
-        """Ensure cleanup happens when the object is garbage collected."""
-        self.cleanup()
\ No newline at end of file
+    def cleanup(self):
+        """Removes the temporary directory used for cloning. Safe to call more than once."""
+        if self.temp_dir is None:
+            return # Already cleaned up (or never cloned)
+        if not Path(self.temp_dir).exists():
+            self.temp_dir = None # Moved elsewhere (e.g. --output-dir); nothing left to remove
+            return
+        try:
+            shutil.rmtree(self.temp_dir, onexc=_clear_readonly_and_retry)
+            print(f"Cleaned up temporary directory: {self.temp_dir}")
+            self.temp_dir = None
+        except Exception as e:
+            print(f"Warning: Failed to clean up temporary directory {self.temp_dir}: {e}")
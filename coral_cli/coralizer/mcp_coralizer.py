@@ -5,6 +5,18 @@ from pathlib import Path
 import subprocess
 from typing import Dict, List, Optional, Tuple
 import json # Added for cleaner dict formatting
+import collections
+import re
+
+BUILD_LOG_TAIL_LINES = 200 # docker build output kept for diagnosing a failed build
+# uv resolves and installs camel-ai's dependency tree much faster than pip; its static binary is
+# copied into the image, and the cache mount lives on another filesystem, so it copies, not links
+UV_IMAGE = "ghcr.io/astral-sh/uv:0.5.11"
+UV_PIP_INSTALL = "--mount=type=cache,target=/root/.cache/uv UV_LINK_MODE=copy uv pip install --system"
+
+def _docker_slug(agent_id: str) -> str:
+    """agent_id reduced to a valid Docker image/container name part (lowercase alphanumerics and dashes)."""
+    return re.sub(r"[^a-z0-9]+", "-", agent_id.lower()).strip("-") or "agent"
 
 class MCPCoralizer:
     def __init__(self, 
@@ -169,19 +181,24 @@ if __name__ == "__main__":
         # Ensure camel-ai[all] is installed for full functionality if needed,
         # or just camel-ai if specific extras aren't required.
         # requests might not be strictly necessary if camel-ai handles HTTP internally.
-        dockerfile = """FROM python:3.10-slim
+        dockerfile = f"""# syntax=docker/dockerfile:1
+FROM python:3.10-slim
 
 WORKDIR /app
 
-# Copy the Coral wrapper
-COPY coral_wrapper.py /app/
-
 # Install dependencies - consider camel-ai[all] if extra features are needed
 # Pinning versions might be good practice for stability
-RUN pip install --no-cache-dir camel-ai>=0.2.0 pydantic>=2.0
+# (quoted, or the shell takes ">=" as a redirect and drops the version bounds)
+# The cache mount keeps downloaded wheels across builds (and agents), outside the image
+COPY --from={UV_IMAGE} /uv /usr/local/bin/uv
+RUN {UV_PIP_INSTALL} "camel-ai>=0.2.0" "pydantic>=2.0"
+
+# Copy the Coral wrapper last: it changes per agent, and copying it before the
+# install would invalidate the cached dependency layer on every build
+COPY coral_wrapper.py /app/
 
 # Set environment variables - API key is passed during 'docker run'
-# ENV OPENAI_API_KEY=${OPENAI_API_KEY} # This is set via 'docker run -e'
+# ENV OPENAI_API_KEY=${{OPENAI_API_KEY}} # This is set via 'docker run -e'
 
 # Run the Coral wrapper
 CMD ["python", "-u", "/app/coral_wrapper.py"]
@@ -211,26 +228,35 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
             dockerfile_path = tmp_path / "Dockerfile"
             
             print(f"Writing wrapper to {wrapper_path}")
-            with open(wrapper_path, "w") as f:
-                f.write(wrapper)
+            wrapper_path.write_text(wrapper, encoding="utf-8")
             
             print(f"Writing Dockerfile to {dockerfile_path}")
-            with open(dockerfile_path, "w") as f:
-                f.write(dockerfile)
+            dockerfile_path.write_text(dockerfile, encoding="utf-8")
             
             # Build Docker image
-            image_name = f"mcp-coralizer-{self.agent_id.lower().replace(' ', '-')}" # Sanitize agent_id for image name
+            agent_slug = _docker_slug(self.agent_id) # Sanitized once for the image and container names
+            image_name = f"mcp-coralizer-{agent_slug}"
+            container_name = f"coral-agent-{agent_slug}"
             print(f"Building Docker image: {image_name}...")
             try:
-                # Run build command, capture output, don't check=True immediately
-                build_process = subprocess.run(
+                # Stream the build log as it arrives instead of holding all of it until
+                # the build ends; only the tail is kept, for the error checks below
+                build_process = subprocess.Popen(
                     ["docker", "build", "-t", image_name, tmpdir],
-                    capture_output=True, text=True, check=False # Don't raise on error yet
+                    env={**os.environ, "DOCKER_BUILDKIT": "1"}, # Cache mounts need BuildKit (opt-in before Docker 23)
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
                 )
+                build_tail = collections.deque(maxlen=BUILD_LOG_TAIL_LINES)
+                with build_process.stdout:
+                    for line in build_process.stdout:
+                        print(line, end="")
+                        build_tail.append(line)
+                build_returncode = build_process.wait()
 
                 # Check for permission error specifically
-                if build_process.returncode != 0:
-                    if "permission denied" in build_process.stderr.lower() and "docker.sock" in build_process.stderr.lower():
+                if build_returncode != 0:
+                    build_stderr = "".join(build_tail).lower() # Lowercase once for both checks
+                    if "permission denied" in build_stderr and "docker.sock" in build_stderr:
                          print("[bold red]Docker Permission Error Detected![/bold red]")
                          print("[bold yellow]The current user does not have permission to access the Docker daemon socket.[/bold yellow]")
                          print("[bold yellow]On Linux, try adding your user to the 'docker' group:[/bold yellow]")
@@ -238,9 +264,8 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
                          print("  2. Log out and log back in, or run: [cyan]newgrp docker[/cyan] in your terminal.")
                          print("[bold yellow]Then, try running the coral command again.[/bold yellow]")
                     else:
-                        # Print generic build error
-                        print(f"[bold red]Error building Docker image (Return Code: {build_process.returncode}):[/bold red]")
-                        print(build_process.stderr)
+                        # Print generic build error (the log itself was already printed above)
+                        print(f"[bold red]Error building Docker image (Return Code: {build_returncode}).[/bold red]")
                     return # Stop if build fails
 
                 print("Docker image built successfully.")
@@ -255,7 +280,7 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
                     "docker", "run", "--rm",
                     "-e", f"OPENAI_API_KEY={api_key}",
                     "--network=host", # Allows connection to localhost:3001 (Coral server)
-                    "--name", f"coral-agent-{self.agent_id.lower().replace(' ', '-')}", # Give container a name
+                    "--name", container_name, # Give container a name
                     image_name
                 ], check=True) # Use check=True here, as permission errors usually happen during build/info commands
 
@@ -269,6 +294,6 @@ CMD ["python", "-u", "/app/coral_wrapper.py"]
             except KeyboardInterrupt:
                 print("\n[bold yellow]Stopping Docker container...[/bold yellow]")
                 # Attempt to stop the container by name if it was started
-                stop_cmd = ["docker", "stop", f"coral-agent-{self.agent_id.lower().replace(' ', '-')}"]
-                subprocess.run(stop_cmd, capture_output=True)
+                stop_cmd = ["docker", "stop", container_name]
+                subprocess.run(stop_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                 print("[bold green]Container stopped.[/bold green]")
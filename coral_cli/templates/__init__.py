@@ -3,8 +3,10 @@ Template management module for Coral CLI
 """
 import os
 import shutil
+import functools
 from pathlib import Path
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
 from rich.console import Console
 
@@ -27,6 +29,55 @@ def get_template_path(framework: str, language: str) -> Path:
     return TEMPLATE_DIR / language / framework
 
 
+def _copy_file(src, dst) -> None:
+    """
+    shutil.copyfile, trying os.copy_file_range first where the platform has it: the kernel
+    copies (or, on btrfs/XFS, reflinks) the data without it passing through userspace.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if not copied:
+                        break # e.g. the source shrank, or the filesystem would not copy this range
+                    remaining -= copied
+            if remaining == 0:
+                return
+            # Kernel copy stopped early: fall through so copyfile rewrites dst in full
+        except OSError:
+            pass # e.g. EXDEV/ENOSYS on older kernels or unsupported filesystems; copyfile rewrites dst
+    shutil.copyfile(src, dst)
+
+
+@functools.lru_cache(maxsize=32)
+def _list_template(framework: str, language: str) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    (directories, files) of a template as paths relative to it, or None if there is no
+    such template. Templates ship with the package, so one walk per process is enough.
+    """
+    template_path = get_template_path(framework, language)
+    if not template_path.is_dir():
+        return None
+    directories, files = [""], []
+
+    def _walk(dir_path: str, relative_dir: str):
+        # scandir's entries carry the dirent type, so is_dir/is_file cost no extra stat, and
+        # relative paths are built while descending instead of re-derived with relpath
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                relative_path = f"{relative_dir}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(relative_path)
+                    _walk(entry.path, f"{relative_path}/")
+                elif entry.is_file():
+                    files.append(relative_path)
+
+    _walk(str(template_path), "")
+    return tuple(directories), tuple(files)
+
+
 def generate_template(framework: str, language: str, output_path: Path) -> None:
     """
     Generate template files for the selected framework and language
@@ -37,23 +88,31 @@ def generate_template(framework: str, language: str, output_path: Path) -> None:
         output_path: Directory to write the files to
     """
     template_path = get_template_path(framework, language)
+    listing = _list_template(framework, language)
     
-    if not template_path.exists():
+    if listing is None:
         console.print(f"[bold red]Error: Template not found for {framework}-{language}[/bold red]")
         raise ValueError(f"Template not found for {framework}-{language}")
     
     # Create output directory if it doesn't exist
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Copy all files from the template directory to the output path
-    for template_file in template_path.glob("**/*"):
-        if template_file.is_file():
-            relative_path = template_file.relative_to(template_path)
-            target_file = output_path / relative_path
-            
-            # Create parent directories if they don't exist
-            target_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Copy the file content
-            shutil.copy2(template_file, target_file)
-            console.print(f"[green]Created: {target_file}[/green]")
\ No newline at end of file
+    # Copy all files from the template directory to the output path, creating each
+    # directory once. The data copy stays in the kernel (see _copy_file); the template's
+    # mode/timestamps aren't copied, so files from a read-only install don't come out
+    # read-only.
+    # Plain strings from here on: no Path object per file
+    directories, files = listing
+    source_root, target_root = str(template_path), str(output_path)
+    for relative_dir in directories:
+        os.makedirs(os.path.join(target_root, relative_dir), exist_ok=True)
+    copies = [(os.path.join(source_root, relative_file), os.path.join(target_root, relative_file)) for relative_file in files]
+
+    # The copies are independent and release the GIL, so overlap them on a small pool
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(copies)))) as executor:
+        # list() so an exception from any worker is raised here
+        list(executor.map(lambda pair: _copy_file(*pair), copies))
+    # One print for the whole list, from this thread only, after the pool is done;
+    # markup=False so brackets in a path aren't read as rich markup
+    if copies:
+        console.print("\n".join(f"Created: {target_file}" for _, target_file in copies), style="green", markup=False)
\ No newline at end of file
@@ -1,6 +1,5 @@
 import asyncio
 import os
-from time import sleep
 
 from camel.agents import ChatAgent
 from camel.models import ModelFactory
@@ -11,6 +10,9 @@ from prompts import get_tools_description, get_user_message
 
 # from dotenv import load_dotenv # for api keys
 
+IDLE_DELAY_SECONDS = 4  # Pause after a step in which the agent had nothing to do
+MAX_IDLE_STEPS = 3  # Stop once this many steps in a row had nothing to do
+
 async def main():
     # Simply add the Coral server address as a tool
     server = MCPClient("http://localhost:3001/sse")
@@ -22,19 +24,28 @@ async def main():
         camel_agent = await create_math_agent(tools)
 
         await camel_agent.astep("Register as user_interaction_agent")
-        sleep(8) # Give other agents a chance to register themselves
+        await asyncio.sleep(8) # Give other agents a chance to register themselves (without blocking the MCP connection)
         await camel_agent.astep(
             "Check in with the other agents to introduce yourself, before we start answering user queries.")
         await camel_agent.astep(
             "Ask the user for a request to work with the other agents to fulfill by calling the ask human tool.")
 
         # Step the agent continuously
+        idle_steps = 0
         for i in range(20):  #This should be infinite, but for testing we limit it to 20 to avoid accidental API fees
             resp = await camel_agent.astep(get_user_message())
             msgzero = resp.msgs[0]
             msgzerojson = msgzero.to_dict()
             print(msgzerojson)
-            sleep(4)
+            # Go straight on while the agent is working (calling tools); only pause after an idle step
+            if resp.info.get("tool_calls"):
+                idle_steps = 0
+                continue
+            idle_steps += 1
+            if idle_steps >= MAX_IDLE_STEPS:
+                print("Agent has been idle for several steps, stopping.")
+                break
+            await asyncio.sleep(IDLE_DELAY_SECONDS)
 
 
 async def create_math_agent(tools):
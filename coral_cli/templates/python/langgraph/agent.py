@@ -1,5 +1,6 @@
 import os
 import asyncio
+import functools
 from typing import Dict, List, Any
 
 from langchain_core.messages import HumanMessage, AIMessage
@@ -8,12 +9,25 @@ from langgraph.prebuilt import create_react_agent
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from prompts import get_tools_description, get_user_message
 
-# Initialize the LLM
-model = ChatOpenAI(
-    model="gpt-4o",
-    temperature=0.3,
-    api_key=os.getenv("OPENAI_API_KEY")
-)
+IDLE_DELAY_SECONDS = 4  # Pause after a step in which the agent had nothing to do
+MAX_IDLE_STEPS = 3  # Stop once this many steps in a row had nothing to do
+
+# Initialize the LLM on first use (not on import), once per process
+@functools.cache
+def get_model():
+    return ChatOpenAI(
+        model="gpt-4o",
+        temperature=0.3,
+        api_key=os.getenv("OPENAI_API_KEY")
+    )
+
+async def warm_up_model_connection():
+    # Opens the model's pooled keep-alive connection to the OpenAI API while the
+    # Coral connection is set up, so the first agent step skips the TCP/TLS handshake
+    try:
+        await get_model().root_async_client.models.list()
+    except Exception:
+        pass  # Only an optimization; the first real request connects as usual
 
 async def main():
     # Configure the MCP client with Coral server
@@ -35,12 +49,17 @@ async def main():
     #     "transport": "sse",
     # }
     
+    warm_up = asyncio.create_task(warm_up_model_connection())
+
     print("Connecting to Coral server...")
     async with MultiServerMCPClient(server_config) as client:
         # Create the agent with tools from the MCP client
         tools = client.get_tools()
-        agent = create_react_agent(model, tools)
+        agent = create_react_agent(get_model(), tools)
         
+        # Usually done by now; otherwise the first request would open a second connection
+        await warm_up
+
         # Register the agent with Coral
         register_message = "Register as user_interaction_agent"
         register_response = await agent.ainvoke({"messages": [HumanMessage(content=register_message)]})
@@ -57,16 +76,26 @@ async def main():
         print(f"Ask user response: {ask_response}")
         
         # Main interaction loop
+        idle_steps = 0
         for i in range(20):  # Limit to 20 iterations for testing
             # In a real implementation, you would get user input here
             user_message = "What's the next step?"
             
-            # Step the agent
-            response = await agent.ainvoke({"messages": [HumanMessage(content=user_message)]})
-            print(f"Agent response: {response}")
+            # Step the agent, printing each new message (model reply, tool call, tool
+            # result) as it arrives rather than the whole state once the step is over
+            async for response in agent.astream({"messages": [HumanMessage(content=user_message)]}, stream_mode="values"):
+                print(f"Agent response: {response['messages'][-1]}")
             
-            # Add a small delay to avoid overwhelming the server
-            await asyncio.sleep(4)
+            # Go straight on while the agent is working (calling tools); only pause
+            # after an idle step, to avoid overwhelming the server
+            if any(getattr(message, "tool_calls", None) for message in response["messages"]):
+                idle_steps = 0
+                continue
+            idle_steps += 1
+            if idle_steps >= MAX_IDLE_STEPS:
+                print("Agent has been idle for several steps, stopping.")
+                break
+            await asyncio.sleep(IDLE_DELAY_SECONDS)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file